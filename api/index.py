@@ -1,20 +1,39 @@
 import asyncio
+import errno
+import functools
 import os
 import shutil
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import Response
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 
 # Add project root to Python path for services imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from services.admission import AdmissionController
 from services.extractor import extract_playlist_info
-from services.downloader import download_video
+from services.downloader import download_video, prefetch_video_info
+from services.naming import format_duration, safe_filename
+
+# Dedicated pool for yt-dlp work so it doesn't compete with the default
+# executor (file copies, StaticFiles, ...). Lives for the whole process.
+_YTDL_EXEC = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("YTDL_WORKERS", "8")),
+    thread_name_prefix="ytdl",
+)
+
+# Max concurrent downloads per process
+download_gate = AdmissionController(
+    int(os.environ.get("MAX_CONCURRENT_DOWNLOADS", "3"))
+)
+
 
 app = FastAPI()
 
@@ -25,16 +44,6 @@ class ExtractRequest(BaseModel):
     url: str
 
 
-class VideoItem(BaseModel):
-    video_id: str
-    title: str
-    thumbnail: Optional[str] = None
-    duration: Optional[int] = None
-    duration_str: Optional[str] = None
-    uploader: Optional[str] = None
-    url: str
-
-
 class DownloadRequest(BaseModel):
     url: str
     fmt: str = "mp3"
@@ -44,17 +53,25 @@ class DownloadRequest(BaseModel):
 
 # --- Helpers ---
 
-def _format_duration(seconds):
-    if not seconds:
-        return None
-    s = int(seconds)
-    m, s = divmod(s, 60)
-    h, m = divmod(m, 60)
-    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+async def _run_ytdl(fn, *args, **kwargs):
+    """Run a blocking yt-dlp call on the dedicated executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _YTDL_EXEC, functools.partial(fn, *args, **kwargs)
+    )
+
 
+def _move_file(src: Path, dest: Path) -> None:
+    """Move src to dest, renaming when possible instead of copying."""
+    try:
+        os.replace(src, dest)  # same filesystem: atomic rename, no data copied
+        return
+    except OSError as e:
+        # Different filesystems (or bind mounts of one) can't be renamed across
+        if e.errno != errno.EXDEV:
+            raise
 
-def _safe_filename(title: str) -> str:
-    return "".join(c for c in title if c.isalnum() or c in " -_().").strip()[:200]
+    shutil.copyfile(src, dest)  # uses sendfile() on Linux
 
 
 # --- Endpoints ---
@@ -66,28 +83,36 @@ async def extract(req: ExtractRequest):
         raise HTTPException(status_code=400, detail="URL is required")
 
     try:
-        info = await asyncio.to_thread(extract_playlist_info, url)
+        info = await _run_ytdl(extract_playlist_info, url)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    videos = []
-    for entry in info["entries"]:
-        videos.append(VideoItem(
-            video_id=entry.get("id", ""),
-            title=entry.get("title", "Unknown"),
-            thumbnail=entry.get("thumbnail")
+    # Plain dicts: yt-dlp output needs no validation, and this skips a
+    # pydantic construct + model_dump per video
+    videos = [
+        {
+            "video_id": entry.get("id", ""),
+            "title": entry.get("title", "Unknown"),
+            "thumbnail": entry.get("thumbnail")
             or (entry.get("thumbnails") or [{}])[-1].get("url"),
-            duration=entry.get("duration"),
-            duration_str=_format_duration(entry.get("duration")),
-            uploader=entry.get("uploader"),
-            url=f"https://www.youtube.com/watch?v={entry.get('id', '')}",
-        ))
+            "duration": entry.get("duration"),
+            "duration_str": format_duration(entry.get("duration")),
+            "uploader": entry.get("uploader"),
+            "url": f"https://www.youtube.com/watch?v={entry.get('id', '')}",
+        }
+        for entry in info["entries"]
+    ]
+
+    # Warm per-video metadata so downloads can skip extraction. Not on
+    # Vercel: instances are frozen after the response and don't share cache.
+    if len(videos) > 1 and os.environ.get("VERCEL") is None:
+        prefetch_video_info([v["url"] for v in videos])
 
     return {
         "playlist_id": info["playlist_id"],
         "title": info["title"],
         "video_count": len(videos),
-        "videos": [v.model_dump() for v in videos],
+        "videos": videos,
     }
 
 
@@ -97,11 +122,12 @@ async def download(req: DownloadRequest):
     tmp_dir = Path(tempfile.mkdtemp(prefix="ytdl_"))
 
     try:
-        filepath = await asyncio.to_thread(
-            download_video, req.url, tmp_dir, audio_only
-        )
+        async with download_gate:
+            filepath = await _run_ytdl(
+                download_video, req.url, tmp_dir, audio_only=audio_only
+            )
 
-        safe_title = _safe_filename(req.title)
+        safe_title = safe_filename(req.title)
         ext = filepath.suffix
 
         # Save directly to chosen folder if provided
@@ -110,21 +136,19 @@ async def download(req: DownloadRequest):
             if not dest_dir.is_dir():
                 raise ValueError(f"Folder not found: {dest_dir}")
             dest_path = dest_dir / f"{safe_title}{ext}"
-            shutil.copy2(filepath, dest_path)
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+            # Move off the event loop so large copies don't stall other requests
+            await asyncio.to_thread(_move_file, filepath, dest_path)
+            await asyncio.to_thread(shutil.rmtree, tmp_dir, ignore_errors=True)
             return {"saved": str(dest_path)}
 
         media_type = "audio/mpeg" if ext == ".mp3" else "video/mp4"
 
-        content = filepath.read_bytes()
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-
-        return Response(
-            content=content,
+        # Stream from disk; the temp dir is removed once the response is sent
+        return FileResponse(
+            path=filepath,
             media_type=media_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{safe_title}{ext}"'
-            },
+            filename=f"{safe_title}{ext}",
+            background=BackgroundTask(shutil.rmtree, tmp_dir, ignore_errors=True),
         )
     except Exception as e:
         shutil.rmtree(tmp_dir, ignore_errors=True)
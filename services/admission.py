@@ -0,0 +1,47 @@
+import asyncio
+
+
+class AdmissionController:
+    """Limits how many downloads run at once.
+
+    Like asyncio.Semaphore, but the limit can be changed at runtime
+    through set_limit() without touching internal state.
+    """
+
+    def __init__(self, limit: int):
+        self._limit = max(1, limit)
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._active -= 1
+            # notify_all, not notify(1): a waiter woken by notify(1) that is
+            # then cancelled doesn't pass the wakeup on, stranding the rest.
+            # Every waiter re-checks the predicate, so this stays correct.
+            self._cond.notify_all()
+
+    async def set_limit(self, limit: int) -> None:
+        async with self._cond:
+            self._limit = max(1, limit)
+            self._cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.release()
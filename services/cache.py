@@ -0,0 +1,55 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, value); ordered oldest-used first for LRU eviction
+        self._data: "OrderedDict[str, tuple[float, object]]" = OrderedDict()
+        # (expires_at, key) in insertion order. The TTL is fixed, so this is
+        # also expiry order and expired entries can be purged from the left.
+        self._expiry: "deque[tuple[float, str]]" = deque()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            expires_at, value = hit
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            expires_at = now + self.ttl
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            self._expiry.append((expires_at, key))
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            # Bound stale markers left behind by re-sets and LRU evictions
+            if len(self._expiry) > 2 * self.maxsize:
+                live = {k: v[0] for k, v in self._data.items()}
+                kept = [e for e in self._expiry if live.get(e[1]) == e[0]]
+                self._expiry.clear()
+                self._expiry.extend(kept)
+
+    def _purge_expired(self, now: float) -> None:
+        """Drop expired entries. Caller must hold _lock."""
+        while self._expiry and self._expiry[0][0] < now:
+            expires_at, key = self._expiry.popleft()
+            hit = self._data.get(key)
+            # Skip stale markers for keys that were re-set or already evicted
+            if hit is not None and hit[0] == expires_at:
+                del self._data[key]
@@ -1,9 +1,18 @@
+import copy
 import os
 import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 import yt_dlp
 
+from services.cache import TTLCache
+from services.extractor import normalize_url
+
 # Try to make ffmpeg available via imageio-ffmpeg (for Vercel)
 try:
     import imageio_ffmpeg
@@ -14,29 +23,50 @@ try:
 except ImportError:
     pass
 
+# Persistent yt-dlp cache so the player JS / signature functions are reused
+# across downloads. Falls back to the temp dir on read-only filesystems.
+try:
+    _CACHE = Path.home() / ".cache" / "ipod-music" / "ytdlp"
+    _CACHE.mkdir(parents=True, exist_ok=True)
+except OSError:
+    _CACHE = Path(tempfile.gettempdir()) / "ipod-music" / "ytdlp"
+    _CACHE.mkdir(parents=True, exist_ok=True)
+_CACHE = str(_CACHE)
+
 
+@lru_cache(maxsize=1)
 def _has_ffmpeg() -> bool:
+    # PATH is fixed up at import time, so one lookup is enough
     return shutil.which("ffmpeg") is not None
 
 
-def download_video(
-    video_url: str,
-    output_dir: Path,
-    audio_only: bool = False,
-) -> Path:
-    """Download a single video/audio to output_dir. Returns path to the file."""
+# Idle YoutubeDL instances keyed by (audio_only, has_ffmpeg). Building one
+# sets up the extractor registry and postprocessors, so reuse them instead
+# of constructing a new instance per download.
+_pool: dict[tuple[bool, bool], list] = {}
+_pool_lock = threading.Lock()
+
 
-    ydl_opts = {
-        "outtmpl": str(output_dir / "%(id)s.%(ext)s"),
+def _base_opts() -> dict:
+    """Options shared by downloads and metadata prefetch."""
+    return {
         "retries": 3,
         "fragment_retries": 3,
         "quiet": True,
         "no_warnings": True,
+        "cachedir": _CACHE,
+        "extractor_args": {"youtube": {"player_skip": ["configs"]}},
     }
 
+
+def _build_ydl(audio_only: bool, has_ffmpeg: bool) -> "yt_dlp.YoutubeDL":
+    ydl_opts = _base_opts()
+    # Output dir is set per call through params["paths"]
+    ydl_opts["outtmpl"] = "%(id)s.%(ext)s"
+
     if audio_only:
         ydl_opts["format"] = "bestaudio/best"
-        if _has_ffmpeg():
+        if has_ffmpeg:
             ydl_opts["postprocessors"] = [
                 {
                     "key": "FFmpegExtractAudio",
@@ -46,23 +76,116 @@ def download_video(
             ]
     else:
         # Video mode — let yt-dlp pick the best format
-        if _has_ffmpeg():
+        if has_ffmpeg:
             ydl_opts["merge_output_format"] = "mp4"
 
+    return yt_dlp.YoutubeDL(ydl_opts)
+
+
+def _acquire_ydl(key: tuple[bool, bool]) -> "yt_dlp.YoutubeDL":
+    with _pool_lock:
+        idle = _pool.get(key)
+        if idle:
+            return idle.pop()
+    return _build_ydl(*key)
+
+
+def _release_ydl(key: tuple[bool, bool], ydl: "yt_dlp.YoutubeDL") -> None:
+    with _pool_lock:
+        _pool.setdefault(key, []).append(ydl)
+
+
+# Playlists up to this size get per-video metadata prefetched after extract
+PREFETCH_THRESHOLD = int(os.environ.get("PREFETCH_THRESHOLD", "50"))
+_PREFETCH_EXEC = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ytdl-prefetch")
+# Full per-video info dicts are much larger than flat playlist entries, so
+# they get their own cache, sized for one prefetched playlist
+_info_cache = TTLCache(maxsize=PREFETCH_THRESHOLD, ttl=1800)
+
+
+def _fetch_video_info(url: str) -> None:
+    key = normalize_url(url)
+    if _info_cache.get(key) is not None:
+        return
+
+    # Same options as the download itself, so the cached info has the full
+    # format list and the player JS lands in the shared cachedir
+    ydl_opts = _base_opts()
+    ydl_opts["skip_download"] = True
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+    except Exception:
+        return  # best effort; the download will extract again
+    if info is not None:
+        info = yt_dlp.YoutubeDL.sanitize_info(info, remove_private_keys=True)
+        _info_cache.set(key, info)
+
+
+def prefetch_video_info(urls: list[str]) -> None:
+    """Warm the per-video metadata cache in the background.
+
+    Returns immediately. download_video picks up cached info so the
+    download only has to fetch the media itself.
+    """
+    if len(urls) > PREFETCH_THRESHOLD:
+        return
+    try:
+        for url in urls:
+            _PREFETCH_EXEC.submit(_fetch_video_info, url)
+    except RuntimeError:
+        pass  # best effort, e.g. interpreter shutting down
+
+
+def _get_cached_video_info(url: str) -> Optional[dict]:
+    """Return a private copy of prefetched info for url, if any."""
+    info = _info_cache.get(normalize_url(url))
+    return copy.deepcopy(info) if info is not None else None
+
+
+# Substrings (lowercase) of yt-dlp errors mapped to user-facing messages,
+# checked in order
+_ERR_PATTERNS = (
+    ("sign in", "Age-restricted or sign-in required"),
+    ("age", "Age-restricted or sign-in required"),
+    ("private", "Video is private"),
+    ("unavailable", "Video is unavailable"),
+    ("copyright", "Blocked by copyright"),
+)
+
+
+def download_video(
+    video_url: str,
+    output_dir: Path,
+    audio_only: bool = False,
+) -> Path:
+    """Download a single video/audio to output_dir. Returns path to the file."""
+
+    key = (audio_only, _has_ffmpeg())
+    ydl = _acquire_ydl(key)
+    ydl.params["paths"] = {"home": str(output_dir)}
+
+    info = _get_cached_video_info(video_url)
+    try:
+        if info is not None:
+            try:
+                ydl.process_ie_result(info, download=True)
+            except yt_dlp.utils.YoutubeDLError:
+                # Called directly, so errors aren't wrapped in DownloadError
+                # (e.g. ExtractorError from format selection). Any failure on
+                # prefetched info, such as stale stream URLs, re-extracts.
+                ydl.download([video_url])
+        else:
             ydl.download([video_url])
     except yt_dlp.utils.DownloadError as e:
         error_msg = str(e)
-        if "Sign in" in error_msg or "age" in error_msg.lower():
-            raise RuntimeError("Age-restricted or sign-in required")
-        if "Private" in error_msg or "private" in error_msg:
-            raise RuntimeError("Video is private")
-        if "unavailable" in error_msg.lower():
-            raise RuntimeError("Video is unavailable")
-        if "copyright" in error_msg.lower():
-            raise RuntimeError("Blocked by copyright")
+        lowered = error_msg.lower()
+        for pattern, message in _ERR_PATTERNS:
+            if pattern in lowered:
+                raise RuntimeError(message)
         raise RuntimeError(f"Download failed: {error_msg[:150]}")
+    finally:
+        _release_ydl(key, ydl)
 
     # Find the output file (skip .part files)
     files = [
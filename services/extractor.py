@@ -1,17 +1,59 @@
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
 import yt_dlp
 
+from services.cache import TTLCache
+
+# Flat playlist results, keyed by normalized URL
+_cache = TTLCache(maxsize=512, ttl=1800)
+
+
+def normalize_url(url: str) -> str:
+    """Reduce a URL to a stable cache key.
+
+    Lowercases the host and, for YouTube, keeps only the query params that
+    identify the content (``v`` and ``list``). youtu.be short links map to
+    the same key as the matching watch URL.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    query = parse_qs(parts.query)
+
+    path = parts.path.rstrip("/") or "/"
+
+    if host in ("youtu.be", "www.youtu.be") and path != "/":
+        query["v"] = [path.lstrip("/")]
+        host, path = "www.youtube.com", "/watch"
+    elif host in ("youtube.com", "m.youtube.com", "music.youtube.com"):
+        host = "www.youtube.com"
+    elif host != "www.youtube.com":
+        # Other sites: query params may be significant, keep them as-is
+        return urlunsplit((parts.scheme.lower(), host, path, parts.query, ""))
+
+    kept = [(k, query[k][0]) for k in ("v", "list") if query.get(k)]
+    return urlunsplit(("https", host, path, urlencode(kept), ""))
+
 
 def extract_playlist_info(url: str) -> dict:
     """Extract playlist/channel metadata without downloading videos.
 
     Uses extract_flat for fast metadata retrieval (1-3s vs 30-60s).
-    Runs in thread executor via asyncio.to_thread().
+    Results are cached in-process for 30 minutes, keyed by normalized URL.
+    Runs in a thread executor (see _run_ytdl in api/index.py).
     """
+    key = normalize_url(url)
+    cached = _cache.get(key)
+    if cached is not None:
+        return {**cached, "entries": list(cached["entries"])}
+
     ydl_opts = {
         "extract_flat": "in_playlist",
         "quiet": True,
         "no_warnings": True,
         "ignoreerrors": True,
+        # Single-video URLs get a full extraction; skip the DASH/HLS
+        # manifests and translated subs, which aren't needed for listing
+        "extractor_args": {"youtube": {"skip": ["dash", "hls", "translated_subs"]}},
     }
 
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
@@ -22,11 +64,13 @@ def extract_playlist_info(url: str) -> dict:
 
     # Handle single video (not a playlist)
     if info.get("_type") != "playlist":
-        return {
+        result = {
             "playlist_id": info.get("id", "single"),
             "title": info.get("title", "Single Video"),
             "entries": [info],
         }
+        _cache.set(key, result)
+        return {**result, "entries": [info]}
 
     entries = []
     for entry in info.get("entries") or []:
@@ -34,8 +78,11 @@ def extract_playlist_info(url: str) -> dict:
             continue  # skip unavailable/private videos
         entries.append(entry)
 
-    return {
+    result = {
         "playlist_id": info.get("id", ""),
         "title": info.get("title", "Playlist"),
         "entries": entries,
     }
+    _cache.set(key, result)
+    return {**result, "entries": list(entries)}
+
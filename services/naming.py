@@ -0,0 +1,22 @@
+import re
+from functools import lru_cache
+
+# Anything other than alphanumerics, "_" and " -()." (\w matches str.isalnum)
+_UNSAFE_CHARS = re.compile(r"[^\w \-().]+")
+
+
+@lru_cache(maxsize=4096)
+def format_duration(seconds):
+    """Format seconds as m:ss or h:mm:ss. Returns None for missing/zero."""
+    if not seconds:
+        return None
+    s = int(seconds)
+    h = s // 3600
+    m = s // 60 % 60
+    s %= 60
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+def safe_filename(title: str) -> str:
+    """Strip characters that aren't safe in filenames; cap at 200 chars."""
+    return _UNSAFE_CHARS.sub("", title).strip()[:200]